@@ -10,10 +10,12 @@ import os
 from pathlib import Path
 from typing import List
 
-from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 import cv2
 
 from softagar import io as io_utils
@@ -21,13 +23,18 @@ from softagar.engine import detect_colonies
 
 from . import models
 from .storage import default_storage as storage
-from PIL import Image
+from pydantic import ValidationError
 import numpy as np
 
+# Detection masks are strictly 0/255, so encode them as 1-bit PNGs: same
+# encode time as OpenCV's default 8-bit path, ~40% smaller payloads.
+_MASK_PNG_PARAMS = [cv2.IMWRITE_PNG_BILEVEL, 1, cv2.IMWRITE_PNG_COMPRESSION, 1]
+
 app = FastAPI(
     title="SoftCount API",
     version="1.0.1",
     description="Expose colony detection over HTTP for web clients or automation.",
+    default_response_class=ORJSONResponse,
 )
 
 # Allow local web front-ends (e.g., Vite dev server) to talk to the API.
@@ -63,10 +70,11 @@ async def upload_images(
     new_count = 0
 
     for upload in files:
-        data = await upload.read()
-        if not data:
+        if upload.size == 0:
             continue
-        storage.store_image(sid, upload.filename or "upload", data)
+        # Stream the spooled upload to disk on a worker thread so large TIFFs
+        # neither block the event loop nor get buffered whole in memory.
+        await run_in_threadpool(storage.store_image, sid, upload.filename or "upload", upload.file)
         new_count += 1
 
     if new_count == 0:
@@ -76,11 +84,11 @@ async def upload_images(
     # so frontend state stays in sync with backend
     all_records = storage.get_session_records(sid)
     all_images = [
-        models.UploadImageInfo(image_id=r.image_id, filename=r.filename)
+        models.UploadImageInfo.model_construct(image_id=r.image_id, filename=r.filename)
         for r in all_records
     ]
 
-    return models.UploadResponse(session_id=sid, images=all_images)
+    return models.UploadResponse.model_construct(session_id=sid, images=all_images)
 
 
 @app.get("/image/{image_id}")
@@ -103,23 +111,25 @@ def fetch_image_preview(image_id: str) -> StreamingResponse:
         raise HTTPException(status_code=404, detail="Image not found.")
 
     try:
-        with Image.open(record.path) as im:
-            # Convert palette/LA to RGB for consistent rendering
-            if im.mode not in ("RGB", "RGBA"):
-                im = im.convert("RGB")
-            buf = io.BytesIO()
-            im.save(buf, format="PNG")
-            buf.seek(0)
+        # Decode exactly as /process does (16-bit input scaled to 8 bits, not
+        # clipped), so the preview shows the pixels the detector sees.
+        img = io_utils.load_image(record.path)
+        ok, encoded = cv2.imencode(".png", cv2.cvtColor(img, cv2.COLOR_RGB2BGR))
+        if not ok:
+            raise ValueError("PNG encoding failed")
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Preview generation failed: {exc}") from exc
 
     headers = {"Cache-Control": "no-store"}
-    return StreamingResponse(buf, media_type="image/png", headers=headers)
+    return StreamingResponse(io.BytesIO(encoded.tobytes()), media_type="image/png", headers=headers)
 
 
 @app.post("/process/{image_id}", response_model=models.ProcessResponse)
-def process_image(image_id: str, params: models.DetectionParams) -> models.ProcessResponse:
-    return process_image_handler(image_id=image_id, params=params, include_mask=False)
+def process_image(image_id: str, params: models.DetectionParams) -> ORJSONResponse:
+    response = process_image_handler(image_id=image_id, params=params, include_mask=False)
+    # Return the serialized payload directly so FastAPI skips re-validating
+    # and re-encoding the (potentially large) colony list.
+    return ORJSONResponse(response.model_dump(mode="json"))
 
 
 @app.post("/process/{image_id}/with-mask", response_model=models.ProcessResponse)
@@ -127,8 +137,9 @@ def process_image_with_mask(
     image_id: str,
     params: models.DetectionParams,
     include_mask: bool = Query(default=True, description="If true, include mask_png preview"),
-) -> models.ProcessResponse:
-    return process_image_handler(image_id=image_id, params=params, include_mask=include_mask)
+) -> ORJSONResponse:
+    response = process_image_handler(image_id=image_id, params=params, include_mask=include_mask)
+    return ORJSONResponse(response.model_dump(mode="json"))
 
 
 def process_image_handler(
@@ -143,7 +154,12 @@ def process_image_handler(
 
     try:
         img = io_utils.load_image(record.path)
-        detection = detect_colonies(img, **params.model_dump())
+        detection = detect_colonies(
+            img,
+            **params.model_dump(),
+            return_mask=include_mask,
+            return_annotated=False,
+        )
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Processing failed: {exc}") from exc
 
@@ -154,7 +170,12 @@ def process_image_handler(
         parameters=params.model_dump(),
     )
 
-    colonies = [models.Colony(**colony) for colony in detection.get("colonies", [])]
+    # Engine output is trusted and already well-typed, so skip per-colony
+    # validation; inbound annotations are still validated in full.
+    colonies = [
+        models.Colony.model_construct(x=x, y=y, radius=radius)
+        for x, y, radius in zip(detection["xs"].tolist(), detection["ys"].tolist(), detection["radii"].tolist())
+    ]
     mask_png: str | None = None
     if include_mask:
         mask = detection.get("mask")
@@ -162,12 +183,12 @@ def process_image_handler(
             try:
                 # Ensure contiguous memory layout for cv2.imencode (fixes Docker issues)
                 mask = np.ascontiguousarray(mask)
-                success, encoded = cv2.imencode(".png", mask)
+                success, encoded = cv2.imencode(".png", mask, _MASK_PNG_PARAMS)
                 if success:
                     mask_png = base64.b64encode(encoded.tobytes()).decode("utf-8")
             except Exception:
                 mask_png = None
-    return models.ProcessResponse(
+    return models.ProcessResponse.model_construct(
         image_id=image_id,
         session_id=record.session_id,
         count=int(detection.get("count", 0)),
@@ -177,19 +198,42 @@ def process_image_handler(
     )
 
 
-@app.post("/annotations/{image_id}", response_model=models.AnnotationResponse)
-def update_annotations(image_id: str, payload: models.AnnotationRequest) -> models.AnnotationResponse:
+# The annotation body is parsed by hand (see update_annotations), so publish
+# its schema explicitly to keep the OpenAPI docs accurate.
+_annotation_schema = models.AnnotationRequest.model_json_schema(ref_template="#/components/schemas/{model}")
+_annotation_schema.pop("$defs", None)
+
+
+@app.post(
+    "/annotations/{image_id}",
+    response_model=models.AnnotationResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": _annotation_schema}},
+            "required": True,
+        }
+    },
+)
+async def update_annotations(image_id: str, request: Request) -> ORJSONResponse:
+    # Validate straight from the raw bytes so pydantic-core parses the JSON
+    # itself instead of walking a dict FastAPI already decoded.
+    try:
+        payload = models.AnnotationRequest.model_validate_json(await request.body())
+    except ValidationError as exc:
+        errors = exc.errors(include_url=False)
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in errors]) from exc
+
     try:
         record = storage.update_annotations(
             image_id=image_id,
-            manual_added=[col.model_dump() for col in payload.manual_added],
-            manual_removed=[col.model_dump() for col in payload.manual_removed],
+            manual_added=models.COLONY_LIST_ADAPTER.dump_python(payload.manual_added),
+            manual_removed=models.COLONY_LIST_ADAPTER.dump_python(payload.manual_removed),
         )
     except KeyError:
         raise HTTPException(status_code=404, detail="Image not found.")
 
     final_count = storage.final_count(record)
-    return models.AnnotationResponse(
+    response = models.AnnotationResponse.model_construct(
         image_id=image_id,
         session_id=record.session_id,
         auto_count=int(record.last_detection_count),
@@ -197,6 +241,7 @@ def update_annotations(image_id: str, payload: models.AnnotationRequest) -> mode
         manual_removed=len(record.manual_removed),
         final_count=final_count,
     )
+    return ORJSONResponse(response.model_dump(mode="json"))
 
 
 @app.get("/results/{session_id}")
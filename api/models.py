@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import List
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 
 
 class Colony(BaseModel):
@@ -17,6 +17,10 @@ class Colony(BaseModel):
     radius: float = Field(..., ge=0, description="Approximate radius (pixels)")
 
 
+# Built once at import; validates/dumps whole colony lists in a single call.
+COLONY_LIST_ADAPTER: TypeAdapter[List[Colony]] = TypeAdapter(List[Colony])
+
+
 class DetectionParams(BaseModel):
     """Engine parameters mirrored from softagar.engine.detect_colonies."""
 
@@ -9,15 +9,53 @@ from __future__ import annotations
 
 import logging
 import mimetypes
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
-from typing import Dict, Iterable, List, Sequence
-from uuid import uuid4
+from typing import BinaryIO, Dict, Iterable, List, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+class _IdPool:
+    """Hand out random 128-bit hex ids from a pre-read block of OS entropy.
+
+    Ids double as access tokens, so they stay cryptographically random; the
+    pool only amortizes the ``os.urandom`` syscall across many ids.
+    """
+
+    _ID_BYTES = 16
+    _BATCH = 256
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._buf = b""
+        self._pos = 0
+        if hasattr(os, "register_at_fork"):  # POSIX only; Windows never forks
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # A forked child must never reuse the parent's unread entropy.
+        self._lock = Lock()
+        self._buf = b""
+        self._pos = 0
+
+    def new_id(self) -> str:
+        with self._lock:
+            if self._pos >= len(self._buf):
+                self._buf = os.urandom(self._ID_BYTES * self._BATCH)
+                self._pos = 0
+            start = self._pos
+            self._pos += self._ID_BYTES
+            return self._buf[start : start + self._ID_BYTES].hex()
+
+
+_new_id = _IdPool().new_id
+
+
 @dataclass
 class ImageRecord:
     """Metadata for a single uploaded image."""
@@ -34,13 +72,18 @@ class ImageRecord:
 
 
 class Storage:
-    """Thread-safe in-memory metadata store backed by a local file cache."""
+    """Thread-safe in-memory metadata store backed by a local file cache.
+
+    The session and image indexes are copy-on-write: writers build a new dict
+    under the lock and rebind the attribute, so lookups read the current
+    snapshot without taking the lock.
+    """
 
     def __init__(self, base_dir: Path | None = None) -> None:
-        self.base_dir = base_dir or Path(__file__).resolve().parent / "_data"
+        self.base_dir = base_dir or _default_base_dir()
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self._lock = Lock()
-        self._sessions: Dict[str, List[str]] = {}
+        self._sessions: Dict[str, Tuple[str, ...]] = {}
         self._images: Dict[str, ImageRecord] = {}
 
         # Clean up orphaned files from previous sessions
@@ -52,32 +95,44 @@ class Storage:
         Since session metadata is stored in memory, any files remaining from
         a previous run are orphaned and can be safely deleted.
         """
-        count = 0
-        for f in self.base_dir.iterdir():
-            if f.is_file():
-                try:
-                    f.unlink()
-                    count += 1
-                except OSError as e:
-                    logger.warning(f"Failed to remove orphaned file {f}: {e}")
+        with os.scandir(self.base_dir) as entries:
+            orphans = [entry.path for entry in entries if entry.is_file()]
+        if not orphans:
+            return
+
+        # Unlinks are independent syscalls, so overlap them to keep a large
+        # leftover cache from delaying startup.
+        with ThreadPoolExecutor(max_workers=min(16, len(orphans))) as executor:
+            count = sum(executor.map(_remove_orphan, orphans))
 
         if count > 0:
             logger.info(f"Cleaned up {count} orphaned file(s) from previous session")
 
     def ensure_session(self, session_id: str | None = None) -> str:
         """Return a session id, creating one if needed."""
-        session_id = session_id or uuid4().hex
+        session_id = session_id or _new_id()
+        if session_id in self._sessions:
+            return session_id
         with self._lock:
-            self._sessions.setdefault(session_id, [])
+            if session_id not in self._sessions:
+                self._sessions = {**self._sessions, session_id: ()}
         return session_id
 
-    def store_image(self, session_id: str, filename: str, data: bytes) -> str:
-        """Persist an uploaded image and return its new image id."""
+    def store_image(self, session_id: str, filename: str, data: bytes | BinaryIO) -> str:
+        """Persist an uploaded image and return its new image id.
+
+        `data` may be raw bytes or a binary file object; file objects are
+        streamed to disk in chunks rather than read into memory.
+        """
         safe_name = Path(filename).name or "upload"
-        image_id = uuid4().hex
+        image_id = _new_id()
         suffix = Path(safe_name).suffix or ".bin"
         path = self.base_dir / f"{image_id}{suffix}"
-        path.write_bytes(data)
+        if isinstance(data, bytes):
+            path.write_bytes(data)
+        else:
+            with path.open("wb") as out:
+                shutil.copyfileobj(data, out, 1 << 20)
 
         record = ImageRecord(
             image_id=image_id,
@@ -86,16 +141,14 @@ class Storage:
             path=path,
         )
         with self._lock:
-            self._images[image_id] = record
-            self._sessions.setdefault(session_id, []).append(image_id)
+            self._images = {**self._images, image_id: record}
+            image_ids = self._sessions.get(session_id, ())
+            self._sessions = {**self._sessions, session_id: (*image_ids, image_id)}
         return image_id
 
     def get_image(self, image_id: str) -> ImageRecord:
         """Return the image record or raise KeyError."""
-        with self._lock:
-            if image_id not in self._images:
-                raise KeyError(image_id)
-            return self._images[image_id]
+        return self._images[image_id]
 
     def save_detection(
         self,
@@ -129,9 +182,9 @@ class Storage:
 
     def get_session_records(self, session_id: str) -> List[ImageRecord]:
         """Return all image records for a session."""
-        with self._lock:
-            image_ids = self._sessions.get(session_id, [])
-            return [self._images[iid] for iid in image_ids if iid in self._images]
+        images = self._images
+        image_ids = self._sessions.get(session_id, ())
+        return [images[iid] for iid in image_ids if iid in images]
 
     def final_count(self, record: ImageRecord) -> int:
         """Compute final count blending auto and manual annotations."""
@@ -148,6 +201,21 @@ class Storage:
         return self._images[image_id]
 
 
+def _remove_orphan(path: str) -> bool:
+    try:
+        os.unlink(path)
+        return True
+    except OSError as e:
+        logger.warning(f"Failed to remove orphaned file {path}: {e}")
+        return False
+
+
+def _default_base_dir() -> Path:
+    """Return `$DATA_DIR` when set (as in the Docker image), else `api/_data`."""
+    data_dir = os.environ.get("DATA_DIR")
+    return Path(data_dir) if data_dir else Path(__file__).resolve().parent / "_data"
+
+
 # Singleton storage used by the FastAPI app.
 default_storage = Storage()
 
@@ -1,7 +1,7 @@
 """Top-level package for the Soft Agar Colony Counter engine."""
 
-from .engine import detect_colonies
+from .engine import DetectionContext, detect_colonies
 
-__all__ = ["detect_colonies"]
+__all__ = ["DetectionContext", "detect_colonies"]
 
 
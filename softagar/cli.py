@@ -3,14 +3,26 @@
 from __future__ import annotations
 
 import argparse
+import itertools
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Callable, Dict, Iterable, List, Sequence
 
-from softagar.engine import detect_colonies
+import cv2
+
+from softagar.engine import DetectionContext, detect_colonies
 from softagar import io as io_utils
 
 IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp"}
+# concurrent.futures caps process pools at 61 workers on Windows
+# (WaitForMultipleObjects handle limit).
+_WINDOWS_MAX_WORKERS = 61
+
+# Scratch buffers reused by every image this process counts (worker
+# processes each get their own).
+_DETECTION_CONTEXT = DetectionContext()
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -50,6 +62,18 @@ def _add_count_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentPa
         action="store_true",
         help="Recursively scan sub-directories for images.",
     )
+    count_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache decoded pixels next to each image as <name>.npy and reuse them on later runs.",
+    )
+    count_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: available CPUs). Use 1 to process images serially.",
+    )
 
     _add_detection_args(count_parser)
 
@@ -102,26 +126,69 @@ def _handle_count(args: argparse.Namespace) -> int:
         raise ValueError(f"No images found under {input_path}")
 
     params = _extract_params(args)
-
-    results = []
-    for image_path in images:
-        img = io_utils.load_image(image_path)
-        detection = detect_colonies(img, **params)
-        filename = str(image_path.relative_to(input_path) if input_path.is_dir() else image_path.name)
-        results.append(
-            {
-                "filename": filename,
-                "count": detection["count"],
-                **params,
-            }
-        )
+    workers = _resolve_workers(args.workers, len(images))
+
+    # Images are independent, so fan them out across processes; map() keeps
+    # the counts in input order.
+    if workers > 1:
+        # One OpenCV thread per worker: the pool already uses every core, and
+        # OpenCV's own per-process thread pool would oversubscribe them.
+        with ProcessPoolExecutor(max_workers=workers, initializer=cv2.setNumThreads, initargs=(1,)) as executor:
+            counts = list(
+                executor.map(_count_image, images, itertools.repeat(params), itertools.repeat(args.cache))
+            )
+    else:
+        counts = [_count_image(image_path, params, args.cache) for image_path in images]
+
+    # Columns rather than one dict per image: the parameter columns are just
+    # repeated references to the same value.
+    columns = {
+        "filename": [
+            str(image_path.relative_to(input_path) if input_path.is_dir() else image_path.name)
+            for image_path in images
+        ],
+        "count": counts,
+        **{name: [value] * len(images) for name, value in params.items()},
+    }
 
     output_path = args.output.expanduser().resolve()
-    io_utils.write_results_csv(results, output_path)
-    print(f"Wrote {len(results)} result(s) to {output_path}")
+    io_utils.write_results_csv(columns, output_path)
+    print(f"Wrote {len(images)} result(s) to {output_path}")
     return 0
 
 
+def _count_image(image_path: Path, params: Dict[str, int | float], cache: bool = False) -> int:
+    """Load a single image and return its colony count (runs in worker processes)."""
+    loader = io_utils.load_image_cached if cache else io_utils.load_image
+    img = loader(image_path, grayscale=True)
+    detection = detect_colonies(
+        img,
+        **params,
+        return_mask=False,
+        return_annotated=False,
+        context=_DETECTION_CONTEXT,
+    )
+    return int(detection["count"])
+
+
+def _resolve_workers(requested: int | None, n_images: int) -> int:
+    """Return the number of worker processes to use for a batch."""
+    if requested is not None and requested < 1:
+        raise ValueError("--workers must be at least 1")
+    workers = requested or _available_cpus()
+    if sys.platform == "win32":
+        # ProcessPoolExecutor rejects more workers than this on Windows.
+        workers = min(workers, _WINDOWS_MAX_WORKERS)
+    return max(1, min(workers, n_images))
+
+
+def _available_cpus() -> int:
+    """Return the CPUs this process may run on (honours affinity/cgroup pinning)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
 def _collect_images(root: Path, recursive: bool) -> List[Path]:
     """Return a sorted list of image paths starting from root."""
     if root.is_file():
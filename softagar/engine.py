@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import functools
 import os
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, Tuple
 
 import cv2
 import numpy as np
@@ -13,25 +15,70 @@ import numpy as np
 if os.environ.get("DOCKER_ENV"):
     cv2.setNumThreads(1)
 
+# CLAHE objects keep scratch buffers between ``apply`` calls, so cached
+# instances are kept per thread rather than shared across API workers.
+_thread_local = threading.local()
 
-def _ensure_grayscale(img: np.ndarray) -> np.ndarray:
-    """Return a grayscale copy of the provided image."""
+
+class DetectionContext:
+    """Scratch buffers reused across `detect_colonies` calls.
+
+    Passing one context to repeated calls on same-sized images lets OpenCV
+    write into existing arrays instead of allocating new frames per image.
+    Arrays returned from a call made with a context (such as `mask`) are
+    views of these buffers and are overwritten by the next call. A context
+    must not be shared between threads.
+    """
+
+    def __init__(self) -> None:
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Return the uint8 buffer `name`, reallocating it if `shape` changed."""
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = self._buffers[name] = np.empty(shape, np.uint8)
+        return buf
+
+
+def _scratch(context: DetectionContext | None, name: str, shape: Tuple[int, ...]) -> np.ndarray | None:
+    """Return a reusable output buffer, or None to let OpenCV allocate."""
+    return None if context is None else context.buffer(name, shape)
+
+
+def _ensure_grayscale(img: np.ndarray, dst: np.ndarray | None = None) -> np.ndarray:
+    """Return the provided image as grayscale (2D input is returned as-is)."""
     if img.ndim == 2:
-        return img.copy()
+        return img
 
     if img.ndim == 3 and img.shape[2] == 3:
         try:
-            return cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+            return cv2.cvtColor(img, cv2.COLOR_RGB2GRAY, dst=dst)
         except cv2.error:
-            return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=dst)
 
     raise ValueError("img must be a 2D (grayscale) or 3D (RGB/BGR) numpy array")
 
 
+def _create_clahe(clip_limit: float, tile_grid_size: int) -> cv2.CLAHE:
+    return cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_grid_size, tile_grid_size))
+
+
+def _get_clahe(clip_limit: float, tile_grid_size: int) -> cv2.CLAHE:
+    """Return a CLAHE instance for these settings, reused within the calling thread."""
+    factory = getattr(_thread_local, "clahe_factory", None)
+    if factory is None:
+        factory = _thread_local.clahe_factory = functools.lru_cache(maxsize=8)(_create_clahe)
+    return factory(clip_limit, tile_grid_size)
+
+
+@functools.lru_cache(maxsize=16)
 def _make_kernel(size: int) -> np.ndarray:
-    """Create a square kernel for morphological operations."""
+    """Return a cached, read-only square kernel for morphological operations."""
     size = max(1, int(size))
-    return np.ones((size, size), np.uint8)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (size, size))
+    kernel.setflags(write=False)
+    return kernel
 
 
 def detect_colonies(
@@ -47,6 +94,9 @@ def detect_colonies(
     max_area: int = 15000,
     clahe_clip_limit: float = 2.0,
     clahe_tile_grid_size: int = 8,
+    return_mask: bool = True,
+    return_annotated: bool = True,
+    context: DetectionContext | None = None,
 ) -> Dict[str, Any]:
     """
     Detect colonies in a soft agar image.
@@ -64,9 +114,17 @@ def detect_colonies(
         max_area: Maximum contour area treated as a colony.
         clahe_clip_limit: Contrast limit for CLAHE pre-processing.
         clahe_tile_grid_size: Grid size for CLAHE (applied equally in both dimensions).
+        return_mask: If False, `mask` is returned as None.
+        return_annotated: If False, skip drawing the annotated preview and
+            return `annotated` as None.
+        context: Optional `DetectionContext` whose buffers are reused for
+            the intermediate and output images instead of allocating new ones.
 
     Returns:
-        Dictionary with colony metadata and intermediate images.
+        Dictionary with colony metadata and intermediate images. Colony
+        centres and radii are provided both as parallel float32 arrays
+        (`xs`, `ys`, `radii`) and as a list of `{"x", "y", "radius"}` dicts
+        (`colonies`).
     """
 
     if max_area <= min_area:
@@ -76,18 +134,24 @@ def detect_colonies(
     if adaptive_block_size % 2 == 0:
         adaptive_block_size += 1
 
-    gray = _ensure_grayscale(img)
-    clahe = cv2.createCLAHE(
-        clipLimit=float(clahe_clip_limit),
-        tileGridSize=(int(clahe_tile_grid_size), int(clahe_tile_grid_size)),
-    )
-    preprocessed = clahe.apply(gray)
+    shape = img.shape[:2]
+    gray = _ensure_grayscale(img, dst=_scratch(context, "gray", shape))
+    clahe = _get_clahe(float(clahe_clip_limit), int(clahe_tile_grid_size))
+    preprocessed = clahe.apply(gray, dst=_scratch(context, "preprocessed", shape))
 
     # Sharpening step disabled - was reducing faint colony visibility
     # kernel_sharpen = np.array([[-1, -1, -1], [-1, 10, -1], [-1, -1, -1]])
     # sharpened = cv2.filter2D(preprocessed, -1, kernel_sharpen)
 
-    _, global_thresh_img = cv2.threshold(preprocessed, int(global_thresh), 255, cv2.THRESH_BINARY_INV)
+    # The threshold and morphology stages all run in place on a single mask
+    # buffer so no full-frame intermediates are allocated between steps.
+    _, mask = cv2.threshold(
+        preprocessed,
+        int(global_thresh),
+        255,
+        cv2.THRESH_BINARY_INV,
+        dst=_scratch(context, "mask", shape),
+    )
     adaptive_thresh = cv2.adaptiveThreshold(
         preprocessed,
         255,
@@ -95,34 +159,44 @@ def detect_colonies(
         cv2.THRESH_BINARY_INV,
         adaptive_block_size,
         int(adaptive_C),
+        dst=_scratch(context, "adaptive", shape),
     )
-    combined_thresh = cv2.bitwise_or(global_thresh_img, adaptive_thresh)
+    cv2.bitwise_or(mask, adaptive_thresh, dst=mask)
 
     kernel = _make_kernel(morph_kernel_size)
-    opening = cv2.morphologyEx(combined_thresh, cv2.MORPH_OPEN, kernel, iterations=int(opening_iterations))
-    dilated = cv2.dilate(opening, kernel, iterations=int(dilation_iterations))
-    closing = cv2.morphologyEx(dilated, cv2.MORPH_CLOSE, kernel, iterations=int(closing_iterations))
-
-    contours, _ = cv2.findContours(closing, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    annotated_bgr = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-    colonies: List[Dict[str, float]] = []
-    for contour in contours:
-        area = cv2.contourArea(contour)
-        if min_area < area < max_area:
-            x, y, w, h = cv2.boundingRect(contour)
-            cx = x + w / 2.0
-            cy = y + h / 2.0
-            radius = max(w, h) / 2.0
-            colonies.append({"x": float(cx), "y": float(cy), "radius": float(radius)})
-            cv2.circle(annotated_bgr, (int(cx), int(cy)), max(1, int(radius)), (0, 255, 0), 2)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, dst=mask, iterations=int(opening_iterations))
+    cv2.dilate(mask, kernel, dst=mask, iterations=int(dilation_iterations))
+    cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, dst=mask, iterations=int(closing_iterations))
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours))
+    kept_idx = np.flatnonzero((areas > min_area) & (areas < max_area))
+    rects = [cv2.boundingRect(contours[i]) for i in kept_idx]
 
-    annotated_rgb = cv2.cvtColor(annotated_bgr, cv2.COLOR_BGR2RGB)
+    # Colony geometry is kept column-wise: one array per field instead of a
+    # dict per colony.
+    boxes = np.array(rects, dtype=np.float32).reshape(-1, 4)
+    xs = boxes[:, 0] + boxes[:, 2] / 2.0
+    ys = boxes[:, 1] + boxes[:, 3] / 2.0
+    radii = np.maximum(boxes[:, 2], boxes[:, 3]) / 2.0
+
+    centers = list(zip(xs.tolist(), ys.tolist(), radii.tolist()))
+
+    annotated_rgb = None
+    if return_annotated:
+        annotated_bgr = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=_scratch(context, "annotated", (*shape, 3)))
+        for cx, cy, radius in centers:
+            cv2.circle(annotated_bgr, (int(cx), int(cy)), max(1, int(radius)), (0, 255, 0), 2)
+        annotated_rgb = cv2.cvtColor(annotated_bgr, cv2.COLOR_BGR2RGB, dst=annotated_bgr)
 
     return {
-        "count": len(colonies),
-        "colonies": colonies,
-        "mask": closing,
+        "count": len(centers),
+        "colonies": [{"x": cx, "y": cy, "radius": radius} for cx, cy, radius in centers],
+        "xs": xs,
+        "ys": ys,
+        "radii": radii,
+        "mask": mask if return_mask else None,
         "annotated": annotated_rgb,
     }
 
@@ -0,0 +1,101 @@
+import os
+import tempfile
+from pathlib import Path
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from softagar import io
+
+# Importing api.main builds the default Storage, whose startup cleanup
+# empties its data directory; aim it at a throwaway one so running the tests
+# never touches a developer's api/_data.
+_DATA_DIR = tempfile.TemporaryDirectory()
+
+try:  # needs the [api] extra plus httpx for the test client
+    from fastapi.testclient import TestClient
+
+    with mock.patch.dict(os.environ, {"DATA_DIR": _DATA_DIR.name}):
+        from api import main
+        from api.storage import Storage
+except ImportError:
+    TestClient = None
+
+
+def tearDownModule() -> None:
+    _DATA_DIR.cleanup()
+
+
+@unittest.skipIf(TestClient is None, "FastAPI test client not available")
+class TestAPI(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(main, "storage", Storage(base_dir=Path(self.tmpdir.name)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+        self.client = TestClient(main.app)
+
+        plate = np.full((240, 240), 255, dtype=np.uint8)
+        for center in ((40, 40), (160, 40)):
+            cv2.circle(plate, center, 25, 0, -1)
+        ok, encoded = cv2.imencode(".png", plate)
+        self.assertTrue(ok)
+
+        upload = self.client.post("/upload", files=[("files", ("plate.png", encoded.tobytes(), "image/png"))])
+        self.assertEqual(upload.status_code, 200)
+        self.image_id = upload.json()["images"][0]["image_id"]
+
+        processed = self.client.post(f"/process/{self.image_id}", json={})
+        self.assertEqual(processed.status_code, 200)
+        self.assertEqual(processed.json()["count"], 2)
+
+    def test_preview_matches_detector_input_for_16_bit_images(self) -> None:
+        data = np.linspace(0, 65535, 64 * 64, dtype=np.uint16).reshape(64, 64)
+        ok, encoded = cv2.imencode(".png", data)
+        self.assertTrue(ok)
+        upload = self.client.post("/upload", files=[("files", ("plate16.png", encoded.tobytes(), "image/png"))])
+        image_id = upload.json()["images"][0]["image_id"]
+
+        response = self.client.get(f"/image/{image_id}/preview")
+
+        self.assertEqual(response.status_code, 200)
+        preview = cv2.imdecode(np.frombuffer(response.content, dtype=np.uint8), cv2.IMREAD_COLOR)
+        record = main.storage.get_image(image_id)
+        np.testing.assert_array_equal(cv2.cvtColor(preview, cv2.COLOR_BGR2RGB), io.load_image(record.path))
+
+    def test_valid_payload_updates_counts(self) -> None:
+        response = self.client.post(
+            f"/annotations/{self.image_id}",
+            json={"manual_added": [{"x": 200.0, "y": 200.0, "radius": 10.0}], "manual_removed": []},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["auto_count"], body["manual_added"], body["final_count"]), (2, 1, 3))
+
+    def test_invalid_field_returns_422_with_body_loc(self) -> None:
+        response = self.client.post(
+            f"/annotations/{self.image_id}",
+            json={"manual_added": [{"x": 1.0, "y": 2.0, "radius": -1.0}]},
+        )
+
+        self.assertEqual(response.status_code, 422)
+        detail = response.json()["detail"]
+        self.assertEqual(detail[0]["loc"], ["body", "manual_added", 0, "radius"])
+
+    def test_malformed_json_returns_json_invalid(self) -> None:
+        response = self.client.post(
+            f"/annotations/{self.image_id}",
+            content=b'{"manual_added": [',
+            headers={"Content-Type": "application/json"},
+        )
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["detail"][0]["type"], "json_invalid")
+
+
+if __name__ == "__main__":
+    unittest.main()
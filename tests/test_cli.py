@@ -3,7 +3,9 @@ import tempfile
 from pathlib import Path
 from typing import List
 import unittest
+from unittest import mock
 
+import cv2
 import numpy as np
 
 from softagar import io
@@ -11,23 +13,29 @@ from softagar import cli
 
 
 class TestCLI(unittest.TestCase):
-    def setUp(self) -> None:
-        self.tmpdir = tempfile.TemporaryDirectory()
-        self.tmp_path = Path(self.tmpdir.name)
-
-    def tearDown(self) -> None:
-        self.tmpdir.cleanup()
-
-    def _create_dummy_image(self, path: Path) -> None:
-        data = np.zeros((32, 32, 3), dtype=np.uint8)
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.tmp_path = Path(cls.tmpdir.name)
+        cls.input_dir = cls.tmp_path / "images"
+        for name, colonies in (("plate_1.png", 1), ("plate_3.png", 3), ("nested/plate_2.png", 2)):
+            cls._create_plate(cls.input_dir / name, colonies)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmpdir.cleanup()
+
+    @staticmethod
+    def _create_plate(path: Path, colonies: int) -> None:
+        """Write a light plate with `colonies` dark, well-separated discs."""
+        data = np.full((240, 240, 3), 255, dtype=np.uint8)
+        for i in range(colonies):
+            cv2.circle(data, (40 + (i % 2) * 120, 40 + (i // 2) * 120), 25, (0, 0, 0), -1)
         path.parent.mkdir(parents=True, exist_ok=True)
         io.save_image(path, data)
 
     def test_count_command_writes_csv(self) -> None:
-        input_dir = self.tmp_path / "images"
-        self._create_dummy_image(input_dir / "plate_1.png")
-        self._create_dummy_image(input_dir / "nested" / "plate_2.png")
-
+        input_dir = self.input_dir
         output_csv = self.tmp_path / "results.csv"
         exit_code = cli.main(
             [
@@ -51,6 +59,35 @@ class TestCLI(unittest.TestCase):
         self.assertIn("filename", header)
         self.assertIn("count", header)
 
+    def test_count_command_serial_matches_parallel(self) -> None:
+        input_dir = self.input_dir
+        outputs = []
+        for workers in ("1", "2"):
+            output_csv = self.tmp_path / f"results_{workers}.csv"
+            exit_code = cli.main(
+                ["count", "--input", str(input_dir), "--output", str(output_csv), "--workers", workers]
+            )
+            self.assertEqual(exit_code, 0)
+            outputs.append(output_csv.read_text())
+
+        self.assertEqual(outputs[0], outputs[1])
+        rows = list(csv.DictReader(outputs[1].splitlines()))
+        counts = [(row["filename"], row["count"]) for row in rows]
+        self.assertEqual(counts, [("plate_1.png", "1"), ("plate_3.png", "3")])
+
+    def test_count_command_cache_reuses_decoded_pixels(self) -> None:
+        outputs = []
+        for run in ("first", "second"):
+            output_csv = self.tmp_path / f"results_cache_{run}.csv"
+            exit_code = cli.main(
+                ["count", "--input", str(self.input_dir), "--output", str(output_csv), "--workers", "1", "--cache"]
+            )
+            self.assertEqual(exit_code, 0)
+            outputs.append(output_csv.read_text())
+
+        self.assertTrue((self.input_dir / "plate_1.png.gray.npy").exists())
+        self.assertEqual(outputs[0], outputs[1])
+
     def test_count_command_errors_without_images(self) -> None:
         empty_dir = self.tmp_path / "empty"
         empty_dir.mkdir()
@@ -58,6 +95,24 @@ class TestCLI(unittest.TestCase):
         self.assertNotEqual(exit_code, 0)
 
 
+class TestResolveWorkers(unittest.TestCase):
+    def test_default_is_capped_by_image_count(self) -> None:
+        with mock.patch.object(cli, "_available_cpus", return_value=8):
+            self.assertEqual(cli._resolve_workers(None, 3), 3)
+            self.assertEqual(cli._resolve_workers(None, 100), 8)
+
+    def test_windows_pool_size_is_capped(self) -> None:
+        with mock.patch.object(cli, "_available_cpus", return_value=128), mock.patch.object(
+            cli.sys, "platform", "win32"
+        ):
+            self.assertEqual(cli._resolve_workers(None, 500), 61)
+            self.assertEqual(cli._resolve_workers(100, 500), 61)
+
+    def test_rejects_non_positive_workers(self) -> None:
+        with self.assertRaises(ValueError):
+            cli._resolve_workers(0, 3)
+
+
 if __name__ == "__main__":
     unittest.main()
 
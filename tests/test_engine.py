@@ -3,7 +3,7 @@ import unittest
 import cv2
 import numpy as np
 
-from softagar.engine import detect_colonies
+from softagar.engine import DetectionContext, detect_colonies
 
 
 class TestDetectColonies(unittest.TestCase):
@@ -17,6 +17,33 @@ class TestDetectColonies(unittest.TestCase):
         self.assertEqual(result["mask"].shape, img.shape[:2])
         self.assertEqual(result["annotated"].shape, img.shape)
 
+    def test_detect_colonies_can_skip_images(self) -> None:
+        img = np.full((128, 128, 3), 240, dtype=np.uint8)
+        cv2.circle(img, (64, 64), 20, (40, 40, 40), -1)
+
+        full = detect_colonies(img, min_area=100)
+        lean = detect_colonies(img, min_area=100, return_mask=False, return_annotated=False)
+
+        self.assertIsNone(lean["mask"])
+        self.assertIsNone(lean["annotated"])
+        self.assertEqual(lean["count"], full["count"])
+        self.assertEqual(lean["colonies"], full["colonies"])
+
+    def test_detect_colonies_context_matches_fresh_buffers(self) -> None:
+        img = np.full((128, 128, 3), 240, dtype=np.uint8)
+        cv2.circle(img, (64, 64), 20, (40, 40, 40), -1)
+        context = DetectionContext()
+
+        for _ in range(2):
+            expected = detect_colonies(img, min_area=100)
+            result = detect_colonies(img, min_area=100, context=context)
+            self.assertEqual(result["colonies"], expected["colonies"])
+            np.testing.assert_array_equal(result["mask"], expected["mask"])
+            np.testing.assert_array_equal(result["annotated"], expected["annotated"])
+
+        resized = detect_colonies(img[:96, :80], min_area=100, context=context)
+        self.assertEqual(resized["mask"].shape, (96, 80))
+
     def test_detect_colonies_identifies_synthetic_disks(self) -> None:
         img = np.full((256, 256, 3), 240, dtype=np.uint8)
         centers = [(80, 80), (180, 150)]
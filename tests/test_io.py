@@ -0,0 +1,230 @@
+import csv
+import os
+import tempfile
+from pathlib import Path
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+from PIL import UnidentifiedImageError
+
+from softagar import io
+
+
+class TestLoadImage(unittest.TestCase):
+    def test_grayscale_matches_rgb2gray_of_rgb_load(self) -> None:
+        data = np.random.default_rng(0).integers(0, 255, (24, 32, 3), dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for suffix in (".png", ".tif", ".jpg"):
+                with self.subTest(suffix=suffix):
+                    image_path = Path(tmpdir) / f"plate{suffix}"
+                    io.save_image(image_path, data)
+
+                    expected = cv2.cvtColor(io.load_image(image_path), cv2.COLOR_RGB2GRAY)
+                    np.testing.assert_array_equal(io.load_image(image_path, grayscale=True), expected)
+
+    def test_16_bit_images_are_scaled_to_8_bits(self) -> None:
+        data = np.linspace(0, 65535, 24 * 32, dtype=np.uint16).reshape(24, 32)
+        expected = (data >> 8).astype(np.uint8)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for suffix in (".png", ".tif"):
+                with self.subTest(suffix=suffix):
+                    image_path = Path(tmpdir) / f"plate{suffix}"
+                    self.assertTrue(cv2.imwrite(str(image_path), data))
+
+                    np.testing.assert_array_equal(io.load_image(image_path, grayscale=True), expected)
+                    np.testing.assert_array_equal(io.load_image(image_path), np.dstack([expected] * 3))
+
+    def test_empty_file_raises_pillow_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = Path(tmpdir) / "plate.png"
+            image_path.touch()
+            with self.assertRaises(UnidentifiedImageError):
+                io.load_image(image_path)
+
+    def test_turbojpeg_decode_and_pillow_fallback(self) -> None:
+        rgb = np.random.default_rng(3).integers(0, 255, (12, 16, 3), dtype=np.uint8)
+
+        class _StubTurboJPEG:
+            def __init__(self, error: bool) -> None:
+                self.error = error
+
+            def decode(self, data: bytes, pixel_format: int) -> np.ndarray:
+                if self.error:
+                    raise OSError("Unsupported color conversion request")
+                return rgb.copy()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = Path(tmpdir) / "plate.jpg"
+            io.save_image(image_path, np.full((6, 6, 3), 90, dtype=np.uint8))
+
+            # TJPF_RGB only exists when the turbojpeg package is importable.
+            with mock.patch.object(io, "TJPF_RGB", 0, create=True):
+                with mock.patch.object(io, "_TURBOJPEG", _StubTurboJPEG(error=False)):
+                    np.testing.assert_array_equal(io.load_image(image_path), rgb)
+                    np.testing.assert_array_equal(
+                        io.load_image(image_path, grayscale=True), cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+                    )
+
+                with mock.patch.object(io, "_TURBOJPEG", _StubTurboJPEG(error=True)):
+                    np.testing.assert_array_equal(io.load_image(image_path), io._load_with_pillow(image_path, False))
+                    np.testing.assert_array_equal(
+                        io.load_image(image_path, grayscale=True), io._load_with_pillow(image_path, True)
+                    )
+
+
+class TestSaveImage(unittest.TestCase):
+    def test_formats_opencv_cannot_encode_fall_back_to_pillow(self) -> None:
+        data = np.random.default_rng(2).integers(0, 255, (8, 8, 3), dtype=np.uint8)
+        mask = np.zeros((8, 8), dtype=bool)
+        mask[2:5, 3:6] = True
+        with tempfile.TemporaryDirectory() as tmpdir:
+            io.save_image(Path(tmpdir) / "plate.gif", data)
+            self.assertEqual(io.load_image(Path(tmpdir) / "plate.gif").shape, (8, 8, 3))
+
+            io.save_image(Path(tmpdir) / "mask.png", mask)
+            np.testing.assert_array_equal(io.load_image(Path(tmpdir) / "mask.png", grayscale=True) > 0, mask)
+
+    def test_unknown_suffix_raises_value_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("plate", "plate.unknown"):
+                with self.subTest(name=name), self.assertRaises(ValueError):
+                    io.save_image(Path(tmpdir) / name, np.zeros((4, 4, 3), dtype=np.uint8))
+
+
+class TestLoadImageCached(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_cache_is_created_and_memory_mapped(self) -> None:
+        image_path = self.tmp_path / "plate.png"
+        data = np.random.default_rng(0).integers(0, 255, (16, 24, 3), dtype=np.uint8)
+        io.save_image(image_path, data)
+
+        first = io.load_image_cached(image_path)
+        cache_path = self.tmp_path / "plate.png.npy"
+        self.assertTrue(cache_path.exists())
+
+        second = io.load_image_cached(image_path)
+        self.assertIsInstance(second, np.memmap)
+        np.testing.assert_array_equal(first, second)
+        np.testing.assert_array_equal(second, io.load_image(image_path))
+
+    def test_stale_cache_is_rebuilt(self) -> None:
+        image_path = self.tmp_path / "plate.png"
+        io.save_image(image_path, np.zeros((8, 8, 3), dtype=np.uint8))
+        io.load_image_cached(image_path, grayscale=True)
+        cache_path = self.tmp_path / "plate.png.gray.npy"
+        os.utime(cache_path, (0, 0))
+
+        io.save_image(image_path, np.full((8, 8, 3), 200, dtype=np.uint8))
+        reloaded = io.load_image_cached(image_path, grayscale=True)
+
+        self.assertEqual(reloaded.shape, (8, 8))
+        self.assertTrue(np.all(reloaded == 200))
+
+    def test_unwritable_cache_falls_back_to_decoded_pixels(self) -> None:
+        image_path = self.tmp_path / "plate.png"
+        data = np.random.default_rng(1).integers(0, 255, (8, 8, 3), dtype=np.uint8)
+        io.save_image(image_path, data)
+
+        with mock.patch("softagar.io.os.replace", side_effect=PermissionError("read-only")):
+            img = io.load_image_cached(image_path)
+
+        np.testing.assert_array_equal(img, data)
+        self.assertEqual(sorted(p.name for p in self.tmp_path.iterdir()), ["plate.png"])
+
+
+class TestMaskRoundTrip(unittest.TestCase):
+    def test_save_mask_and_memory_map(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mask = np.zeros((12, 20), dtype=np.uint8)
+            mask[3:7, 5:15] = 255
+            written = io.save_mask(Path(tmpdir) / "masks" / "plate.png", mask)
+
+            self.assertEqual(written, Path(tmpdir) / "masks" / "plate.png.npy")
+            loaded = io.load_mask_mmap(Path(tmpdir) / "masks" / "plate.png")
+            self.assertIsInstance(loaded, np.memmap)
+            np.testing.assert_array_equal(loaded, mask)
+            np.testing.assert_array_equal(io.load_mask_mmap(written), mask)
+            del loaded
+
+    def test_masks_for_same_stem_do_not_collide(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            png_mask = np.full((4, 4), 255, dtype=np.uint8)
+            tif_mask = np.zeros((4, 4), dtype=np.uint8)
+            io.save_mask(Path(tmpdir) / "plate.png", png_mask)
+            io.save_mask(Path(tmpdir) / "plate.tif", tif_mask)
+
+            np.testing.assert_array_equal(np.load(Path(tmpdir) / "plate.png.npy"), png_mask)
+            np.testing.assert_array_equal(np.load(Path(tmpdir) / "plate.tif.npy"), tif_mask)
+
+
+class TestWriteResultsCsv(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_rows_with_differing_keys(self) -> None:
+        output = self.tmp_path / "out" / "results.csv"
+        io.write_results_csv(
+            [
+                {"count": 3, "filename": "a, b.png", "min_area": 10},
+                {"filename": "c.png", "count": 0, "note": 'say "hi"'},
+            ],
+            output,
+        )
+
+        with output.open(newline="") as handle:
+            rows = list(csv.reader(handle))
+
+        self.assertEqual(rows[0], ["filename", "count", "min_area", "note"])
+        self.assertEqual(rows[1], ["a, b.png", "3", "10", ""])
+        self.assertEqual(rows[2], ["c.png", "0", "", 'say "hi"'])
+
+    def test_explicit_fieldnames_stream_generator(self) -> None:
+        output = self.tmp_path / "results.csv"
+        rows = ({"filename": f"p{i}.png", "count": i, "ignored": True} for i in range(3))
+        io.write_results_csv(rows, output, fieldnames=["filename", "count"])
+
+        with output.open(newline="") as handle:
+            written = list(csv.reader(handle))
+
+        self.assertEqual(written, [["filename", "count"], ["p0.png", "0"], ["p1.png", "1"], ["p2.png", "2"]])
+
+    def test_columns_match_rows(self) -> None:
+        rows_output = self.tmp_path / "rows.csv"
+        columns_output = self.tmp_path / "columns.csv"
+        io.write_results_csv(
+            [{"filename": "a.png", "count": 2, "min_area": 1.5}, {"filename": "b.png", "count": 0, "min_area": 1.5}],
+            rows_output,
+        )
+        io.write_results_csv(
+            {"count": np.array([2, 0]), "filename": ["a.png", "b.png"], "min_area": np.array([1.5, 1.5])},
+            columns_output,
+        )
+
+        self.assertEqual(columns_output.read_text(), rows_output.read_text())
+
+    def test_columns_with_unequal_lengths_are_rejected(self) -> None:
+        output = self.tmp_path / "results.csv"
+        with self.assertRaises(ValueError):
+            io.write_results_csv({"filename": ["a.png", "b.png", "c.png"], "count": [1, 2]}, output)
+        self.assertFalse(output.exists())
+
+    def test_empty_results_write_header_only(self) -> None:
+        output = self.tmp_path / "results.csv"
+        io.write_results_csv([], output)
+        self.assertEqual(output.read_text(), "filename,count\n")
+
+
+if __name__ == "__main__":
+    unittest.main()